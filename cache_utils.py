@@ -0,0 +1,34 @@
+"""
+Cache Utilities - Shared location and file writing for on-disk caches
+Kept free of MT5 imports so modules that run without the terminal can use it too
+"""
+
+import os
+import logging
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+# User-writable even when the app itself is installed read-only (e.g. a packaged Electron build)
+CACHE_ROOT = os.path.join(os.path.expanduser('~'), '.comfytrade', 'cache')
+
+
+def atomic_write(path, write):
+    """Write a cache file through a temp file + rename so readers never see a partial file
+
+    write(f) receives the temp file opened in binary mode. Missing parent directories are
+    created. Failures are logged and ignored - a cache that cannot be written just means
+    a full fetch next time.
+    """
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                write(f)
+            os.replace(tmp_path, path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+    except Exception as e:
+        logger.warning(f"Could not write cache file {path}: {e}")
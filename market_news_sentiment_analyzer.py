@@ -24,13 +24,37 @@ Usage:
 """
 
 import os
+import re
+import sys
 import json
+import time
+import hashlib
 import logging
 import argparse
-from typing import Any, Dict, List, Optional
-from datetime import datetime, timedelta
+import functools
+import threading
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, TextIO, Tuple
+from datetime import date, datetime, timedelta
 from dotenv import load_dotenv
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from cache_utils import CACHE_ROOT, atomic_write
+
+# Optional: incremental JSON parsing lets fetch_news stop reading once it has enough articles
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Optional: C-accelerated JSON encoding/decoding, stdlib json is used when missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Load environment variables
 load_dotenv()
@@ -61,11 +85,34 @@ SUPPORTED_TOPICS = [
     "retail_wholesale",
     "technology"
 ]
+_SUPPORTED_TOPICS_SET = frozenset(SUPPORTED_TOPICS)
 
 # Sort options
 SORT_OPTIONS = ["LATEST", "EARLIEST", "RELEVANCE"]
 
+# Default location and lifetime of cached API responses
+CACHE_DIR = os.path.join(CACHE_ROOT, "news")
+DEFAULT_CACHE_TTL = timedelta(minutes=15)
+
+# Alpha Vantage free tier request limit
+DEFAULT_REQUESTS_PER_MINUTE = 5
+
+# Exact shapes of the date formats parse_date_to_standard understands, tried in this order.
+# Matching these directly avoids a chain of strptime attempts (and their exceptions) per article.
+_DATE_PATTERNS = (
+    # Alpha Vantage: "20250410T0130" or "20251105T121200"
+    re.compile(r"(?P<Y>[1-9]\d{3})(?P<M>\d{2})(?P<D>\d{2})T(?P<h>\d{2})(?P<mi>\d{2})(?P<s>\d{2})?"),
+    # ISO 8601: "2025-04-10T01:30:00", optional fraction and "Z" / "+HH:MM" suffix
+    re.compile(r"(?P<Y>[1-9]\d{3})-(?P<M>\d{2})-(?P<D>\d{2})T(?P<h>\d{2}):(?P<mi>\d{2}):(?P<s>\d{2})(?:\.\d+)?(?:Z|\+.*)?"),
+    # Standard: "2025-04-10 01:30:00"
+    re.compile(r"(?P<Y>[1-9]\d{3})-(?P<M>\d{2})-(?P<D>\d{2}) (?P<h>\d{2}):(?P<mi>\d{2}):(?P<s>\d{2})"),
+    # Date only: "2025-04-10"
+    re.compile(r"(?P<Y>[1-9]\d{3})-(?P<M>\d{2})-(?P<D>\d{2})"),
+)
 
+
+# Articles in a feed often share timestamps, and the same feed may be formatted more than once
+@functools.lru_cache(maxsize=4096)
 def parse_date_to_standard(date_str: str) -> str:
     """
     Convert various date formats to standard format (YYYY-MM-DD HH:MM:SS)
@@ -79,6 +126,19 @@ def parse_date_to_standard(date_str: str) -> str:
     if not date_str or date_str == "unknown":
         return "unknown"
 
+    # Fast path: the fields are already zero-padded, so only the calendar values need validating
+    for pattern in _DATE_PATTERNS:
+        match = pattern.fullmatch(date_str)
+        if match:
+            fields = match.groupdict(default="00")
+            year, month, day = fields["Y"], fields["M"], fields["D"]
+            hour, minute, second = fields.get("h", "00"), fields.get("mi", "00"), fields.get("s", "00")
+            try:
+                datetime(int(year), int(month), int(day), int(hour), int(minute), int(second))
+            except ValueError:
+                break
+            return f"{year}-{month}-{day} {hour}:{minute}:{second}"
+
     # Handle Alpha Vantage format: "20250410T0130" or "20251105T121200"
     try:
         if "T" in date_str:
@@ -141,6 +201,20 @@ def convert_to_alphavantage_date(date_str: str) -> str:
     Returns:
         Date in Alpha Vantage format "YYYYMMDDTHHMM"
     """
+    # Fast path: a well-formed date is a pure rearrangement of its digits
+    length = len(date_str)
+    if (length == 10 or (length == 19 and date_str[10] == " " and date_str[13] == ":" and date_str[16] == ":")) \
+            and date_str[4] == "-" and date_str[7] == "-":
+        year, month, day = date_str[0:4], date_str[5:7], date_str[8:10]
+        hour, minute, second = (date_str[11:13], date_str[14:16], date_str[17:19]) if length == 19 else ("00", "00", "00")
+        digits = year + month + day + hour + minute + second
+        if digits.isascii() and digits.isdigit() and year[0] != "0":
+            try:
+                datetime(int(year), int(month), int(day), int(hour), int(minute), int(second))
+                return f"{year}{month}{day}T{hour}{minute}"
+            except ValueError:
+                pass
+
     try:
         if " " in date_str:
             dt = datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S")
@@ -152,17 +226,192 @@ def convert_to_alphavantage_date(date_str: str) -> str:
         raise ValueError(f"Invalid date format: {date_str}")
 
 
+@functools.lru_cache(maxsize=32)
+def _date_window(today_iso: str, days_back: int) -> Tuple[str, str]:
+    """
+    Get the (from, to) strings for a look-back window ending today, in Alpha Vantage format
+    
+    Returned as "YYYYMMDDT0000" (midnight) so fetch_news passes them through without reparsing.
+    
+    Args:
+        today_iso: Today's date in ISO format (part of the cache key, so the window rolls over daily)
+        days_back: Number of days to look back
+        
+    Returns:
+        Tuple of (time_from, time_to) strings
+    """
+    today = date.fromisoformat(today_iso)
+    time_from = today - timedelta(days=days_back)
+    return (
+        f"{time_from.year:04d}{time_from.month:02d}{time_from.day:02d}T0000",
+        f"{today.year:04d}{today.month:02d}{today.day:02d}T0000"
+    )
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter
+    """
+    
+    def __init__(self, rate: float, capacity: int):
+        """
+        Initialize the bucket (starts full)
+        
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Take one token, blocking until one is available"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class RequestCoalescer:
+    """
+    Share a single in-flight call between concurrent callers that ask for the same key
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, Future] = {}
+    
+    def run(self, key: str, func: Callable[[], Any]) -> Any:
+        """
+        Call func(), or wait for the result of an identical call already in progress
+        
+        Args:
+            key: Identity of the call (callers with equal keys share one result)
+            func: Function performing the call
+            
+        Returns:
+            The result of func(); exceptions are raised to every waiting caller
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = self._in_flight[key] = Future()
+        
+        if not is_owner:
+            return future.result()
+        
+        try:
+            result = func()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+
+class FileCache:
+    """
+    JSON file cache for API responses, expired by file modification time
+    
+    Entries are stored as <cache_dir>/<namespace>/<key>.json
+    """
+    
+    def __init__(self, cache_dir: str = CACHE_DIR, ttl: timedelta = DEFAULT_CACHE_TTL):
+        """
+        Initialize the cache
+        
+        Args:
+            cache_dir: Root directory for cache files
+            ttl: How long an entry stays valid after it was written
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+    
+    @staticmethod
+    def make_key(params: Dict[str, Any]) -> str:
+        """
+        Build a stable cache key from request parameters
+        
+        Args:
+            params: Request parameters
+            
+        Returns:
+            MD5 hex digest of the normalized parameters
+        """
+        return hashlib.md5(json.dumps(params, sort_keys=True).encode("utf-8")).hexdigest()
+    
+    def _path(self, namespace: str, key: str) -> str:
+        # Symbols like "CRYPTO:BTC" or "AAPL,MSFT" are not valid directory names everywhere
+        safe_namespace = re.sub(r"[^A-Za-z0-9_.-]", "_", namespace)
+        return os.path.join(self.cache_dir, safe_namespace, f"{key}.json")
+    
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """
+        Read a cached value
+        
+        Args:
+            namespace: Cache sub-directory (e.g. the ticker)
+            key: Cache key from make_key()
+            
+        Returns:
+            The cached value, or None if missing, expired or unreadable
+        """
+        path = self._path(namespace, key)
+        try:
+            age = datetime.now().timestamp() - os.path.getmtime(path)
+            if age > self.ttl.total_seconds():
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        """
+        Write a value to the cache (failures are logged, not raised)
+        
+        Args:
+            namespace: Cache sub-directory (e.g. the ticker)
+            key: Cache key from make_key()
+            value: JSON-serializable value
+        """
+        path = self._path(namespace, key)
+        # Write through a temp file so a concurrent reader never sees a partial entry
+        atomic_write(path, lambda f: f.write(
+            json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")))
+
+
 class MarketNewsAnalyzer:
     """
     Main class for market news and sentiment analysis using Alpha Vantage API
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        cache_ttl: Optional[timedelta] = DEFAULT_CACHE_TTL,
+        requests_per_minute: Optional[int] = DEFAULT_REQUESTS_PER_MINUTE
+    ):
         """
         Initialize the analyzer
         
         Args:
             api_key: Alpha Vantage API key. If not provided, reads from ALPHAADVANTAGE_API_KEY env var
+            cache_ttl: How long API responses are reused from the on-disk cache (None disables caching)
+            requests_per_minute: API request rate limit shared by all calls (None disables throttling)
         """
         self.api_key = api_key or os.environ.get("ALPHAADVANTAGE_API_KEY")
         if not self.api_key:
@@ -171,6 +420,30 @@ class MarketNewsAnalyzer:
                 "Please set ALPHAADVANTAGE_API_KEY environment variable or pass api_key parameter."
             )
         self.base_url = "https://www.alphavantage.co/query"
+        self._cache = FileCache(ttl=cache_ttl) if cache_ttl else None
+        self._rate_limiter = (
+            TokenBucket(rate=requests_per_minute / 60, capacity=requests_per_minute)
+            if requests_per_minute else None
+        )
+        self._coalescer = RequestCoalescer()
+        
+        # Reuse connections across calls instead of a new TCP + TLS handshake per request
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        ))
+    
+    def close(self) -> None:
+        """Close pooled HTTP connections"""
+        self._session.close()
+    
+    def __enter__(self) -> "MarketNewsAnalyzer":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
     
     def fetch_news(
         self,
@@ -218,26 +491,60 @@ class MarketNewsAnalyzer:
         if time_to:
             params["time_to"] = time_to
         
-        try:
-            response = requests.get(self.base_url, params=params, timeout=30)
-            response.raise_for_status()
-            
-            json_data = response.json()
-            
-            # Check for API errors
-            if "Error Message" in json_data:
-                raise Exception(f"Alpha Vantage API error: {json_data['Error Message']}")
-            if "Note" in json_data:
-                raise Exception(f"Alpha Vantage API note: {json_data['Note']}")
+        # The API key does not affect the response, so leave it out of the cache key
+        cache_namespace = tickers or "_all"
+        cache_key = FileCache.make_key({k: v for k, v in params.items() if k != "apikey"})
+        if self._cache:
+            cached_feed = self._cache.get(cache_namespace, cache_key)
+            if cached_feed is not None:
+                logger.info(f"Using cached news for {cache_namespace} ({len(cached_feed)} articles)")
+                return cached_feed[:params["limit"]]
+        
+        # Identical concurrent requests (e.g. repeated tickers in get_news_by_tickers) share one API call
+        feed = self._coalescer.run(cache_key, lambda: self._request_feed(params, cache_namespace, cache_key))
+        return feed[:params["limit"]]
+    
+    def _request_feed(self, params: Dict[str, Any], cache_namespace: str, cache_key: str) -> List[Dict[str, Any]]:
+        """
+        Query the API and store a non-empty feed in the cache
+        
+        Args:
+            params: Request parameters built by fetch_news
+            cache_namespace: Cache sub-directory for the response
+            cache_key: Cache key for the response
             
-            # Extract feed data
-            feed = json_data.get("feed", [])
+        Returns:
+            List of news articles (may hold more than params["limit"])
+        """
+        if self._rate_limiter:
+            self._rate_limiter.acquire()
+        
+        try:
+            with self._session.get(self.base_url, params=params, timeout=30, stream=ijson is not None) as response:
+                response.raise_for_status()
+                
+                if ijson is not None:
+                    feed = self._read_feed_stream(response, params["limit"])
+                else:
+                    json_data = orjson.loads(response.content) if orjson is not None else response.json()
+                    
+                    # Check for API errors
+                    if "Error Message" in json_data:
+                        raise Exception(f"Alpha Vantage API error: {json_data['Error Message']}")
+                    if "Note" in json_data:
+                        raise Exception(f"Alpha Vantage API note: {json_data['Note']}")
+                    
+                    # Extract feed data
+                    feed = json_data.get("feed", [])
             
             if not feed:
                 logger.warning("Alpha Vantage API returned empty feed")
                 return []
             
-            return feed[:params["limit"]]
+            if self._cache:
+                self._cache.set(cache_namespace, cache_key, feed)
+            
+            return feed
             
         except requests.exceptions.RequestException as e:
             logger.error(f"Alpha Vantage API request failed: {e}")
@@ -246,6 +553,47 @@ class MarketNewsAnalyzer:
             logger.error(f"Alpha Vantage API error: {e}")
             raise
     
+    def _read_feed_stream(self, response: requests.Response, limit: int) -> List[Dict[str, Any]]:
+        """
+        Incrementally parse a NEWS_SENTIMENT response, stopping after `limit` articles
+        
+        The rest of the body is still read (without parsing) so the connection can go back
+        to the session's keep-alive pool; closing it unread would force a new TLS handshake.
+        
+        Args:
+            response: Streaming response (requested with stream=True)
+            limit: Maximum number of articles to parse
+            
+        Returns:
+            List of news articles
+        """
+        response.raw.decode_content = True  # Let urllib3 undo gzip transfer encoding
+        
+        feed = []
+        builder = None
+        # use_float keeps numbers as floats (not Decimal) so articles stay JSON-serializable
+        for prefix, event, value in ijson.parse(response.raw, use_float=True):
+            if builder is not None:
+                builder.event(event, value)
+                if prefix == "feed.item" and event == "end_map":
+                    feed.append(builder.value)
+                    builder = None
+                    if len(feed) >= limit:
+                        break
+            elif prefix == "feed.item" and event == "start_map":
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+            elif prefix == "Error Message" and event == "string":
+                raise Exception(f"Alpha Vantage API error: {value}")
+            elif prefix == "Note" and event == "string":
+                raise Exception(f"Alpha Vantage API note: {value}")
+        
+        # Drain whatever follows the last article we kept (a no-op if the parser reached the end)
+        while response.raw.read(64 * 1024):
+            pass
+        
+        return feed
+    
     def get_news_by_ticker(
         self,
         ticker: str,
@@ -265,17 +613,47 @@ class MarketNewsAnalyzer:
         Returns:
             List of news articles
         """
-        time_to = datetime.now()
-        time_from = time_to - timedelta(days=days_back)
+        time_from, time_to = _date_window(date.today().isoformat(), days_back)
         
         return self.fetch_news(
             tickers=ticker,
-            time_from=time_from.strftime("%Y-%m-%d"),
-            time_to=time_to.strftime("%Y-%m-%d"),
+            time_from=time_from,
+            time_to=time_to,
             sort=sort,
             limit=limit
         )
     
+    def get_news_by_tickers(
+        self,
+        tickers: List[str],
+        days_back: int = 7,
+        sort: str = "LATEST",
+        limit: int = 20,
+        max_workers: int = 4
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get news for several tickers separately, fetching them concurrently
+        
+        Unlike passing "AAPL,MSFT" to get_news_by_ticker (articles mentioning all tickers),
+        this returns each ticker's own news. Requests share the session and rate limiter.
+        
+        Args:
+            tickers: Stock symbols (e.g., ["AAPL", "MSFT"])
+            days_back: Number of days to look back (default: 7)
+            sort: Sort order (default: "LATEST")
+            limit: Maximum number of articles per ticker (default: 20)
+            max_workers: Maximum number of concurrent requests (default: 4)
+            
+        Returns:
+            Dictionary mapping each ticker to its list of news articles
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                ticker: executor.submit(self.get_news_by_ticker, ticker, days_back, sort, limit)
+                for ticker in tickers
+            }
+            return {ticker: future.result() for ticker, future in futures.items()}
+    
     def get_news_by_topic(
         self,
         topic: str,
@@ -295,16 +673,17 @@ class MarketNewsAnalyzer:
         Returns:
             List of news articles
         """
-        if topic not in SUPPORTED_TOPICS:
-            logger.warning(f"Topic '{topic}' may not be supported. Supported topics: {SUPPORTED_TOPICS}")
+        # Check each topic of a comma-separated list (e.g. "technology,ipo") on its own
+        for name in topic.split(","):
+            if name.strip() not in _SUPPORTED_TOPICS_SET:
+                logger.warning(f"Topic '{name.strip()}' may not be supported. Supported topics: {SUPPORTED_TOPICS}")
         
-        time_to = datetime.now()
-        time_from = time_to - timedelta(days=days_back)
+        time_from, time_to = _date_window(date.today().isoformat(), days_back)
         
         return self.fetch_news(
             topics=topic,
-            time_from=time_from.strftime("%Y-%m-%d"),
-            time_to=time_to.strftime("%Y-%m-%d"),
+            time_from=time_from,
+            time_to=time_to,
             sort=sort,
             limit=limit
         )
@@ -362,47 +741,42 @@ class MarketNewsAnalyzer:
                 "ticker_sentiment": {}
             }
         
-        sentiment_scores = []
-        sentiment_labels = {}
-        ticker_sentiments = {}
+        # Overall sentiment - only articles with a non-empty, non-zero score are counted
+        scored = [
+            (article["overall_sentiment_score"], article.get("overall_sentiment_label", "Unknown"))
+            for article in articles
+            if article.get("overall_sentiment_score")
+        ]
+        sentiment_scores = [float(score) for score, _ in scored]
+        sentiment_labels = dict(Counter([label for _, label in scored]))
         
+        # Ticker sentiment - every mention counts towards the labels, scores only when present
+        ticker_scores = {}
+        ticker_labels = {}
         for article in articles:
-            # Overall sentiment
-            score = article.get("overall_sentiment_score", 0)
-            label = article.get("overall_sentiment_label", "Unknown")
-            
-            if score:
-                sentiment_scores.append(float(score))
-                sentiment_labels[label] = sentiment_labels.get(label, 0) + 1
-            
-            # Ticker sentiment
-            ticker_sentiment = article.get("ticker_sentiment", [])
-            for ticker_info in ticker_sentiment:
+            for ticker_info in article.get("ticker_sentiment", ()):
                 ticker = ticker_info.get("ticker", "Unknown")
-                ticker_score = ticker_info.get("ticker_sentiment_score", 0)
-                ticker_label = ticker_info.get("ticker_sentiment_label", "Unknown")
-                
-                if ticker not in ticker_sentiments:
-                    ticker_sentiments[ticker] = {
-                        "scores": [],
-                        "labels": {}
-                    }
+                labels = ticker_labels.get(ticker)
+                if labels is None:
+                    labels = ticker_labels[ticker] = {}
+                    ticker_scores[ticker] = []
                 
+                ticker_score = ticker_info.get("ticker_sentiment_score", 0)
                 if ticker_score:
-                    ticker_sentiments[ticker]["scores"].append(float(ticker_score))
-                ticker_sentiments[ticker]["labels"][ticker_label] = \
-                    ticker_sentiments[ticker]["labels"].get(ticker_label, 0) + 1
+                    ticker_scores[ticker].append(float(ticker_score))
+                ticker_label = ticker_info.get("ticker_sentiment_label", "Unknown")
+                labels[ticker_label] = labels.get(ticker_label, 0) + 1
         
         # Calculate averages
         avg_sentiment = sum(sentiment_scores) / len(sentiment_scores) if sentiment_scores else 0
         
         # Calculate ticker averages
         ticker_averages = {}
-        for ticker, data in ticker_sentiments.items():
-            avg = sum(data["scores"]) / len(data["scores"]) if data["scores"] else 0
+        for ticker, labels in ticker_labels.items():
+            scores = ticker_scores[ticker]
             ticker_averages[ticker] = {
-                "average_sentiment": avg,
-                "label_distribution": data["labels"]
+                "average_sentiment": sum(scores) / len(scores) if scores else 0,
+                "label_distribution": labels
             }
         
         return {
@@ -412,16 +786,16 @@ class MarketNewsAnalyzer:
             "ticker_sentiment": ticker_averages
         }
     
-    def format_article(self, article: Dict[str, Any], include_details: bool = True) -> str:
+    def _article_lines(self, article: Dict[str, Any], include_details: bool = True) -> List[str]:
         """
-        Format a single article for display
+        Build the lines of a formatted article (joined with "\n" by the callers)
         
         Args:
             article: Article dictionary
             include_details: Whether to include detailed sentiment info
             
         Returns:
-            Formatted string
+            List of output lines
         """
         title = article.get("title", "N/A")
         url = article.get("url", "N/A")
@@ -432,40 +806,58 @@ class MarketNewsAnalyzer:
         # Format time
         time_formatted = parse_date_to_standard(time_published)
         
-        result = f"""
+        # Only mark the summary as cut off when it actually was
+        if len(summary) > 500:
+            summary = summary[:500] + "..."
+        
+        lines = [f"""
 {'='*80}
 Title: {title}
 Source: {source}
 Published: {time_formatted}
 URL: {url}
 {'='*80}
-Summary: {summary[:500]}...
-"""
+Summary: {summary}
+"""]
         
         if include_details:
             # Overall sentiment
             overall_sentiment = article.get("overall_sentiment_score", "N/A")
             sentiment_label = article.get("overall_sentiment_label", "N/A")
-            result += f"\nOverall Sentiment: {sentiment_label} (score: {overall_sentiment})"
+            lines.append(f"Overall Sentiment: {sentiment_label} (score: {overall_sentiment})")
             
             # Ticker sentiment
             ticker_sentiment = article.get("ticker_sentiment", [])
             if ticker_sentiment:
-                result += "\n\nTicker Sentiment:"
-                for ticker_info in ticker_sentiment:
-                    ticker = ticker_info.get("ticker", "N/A")
-                    relevance = ticker_info.get("relevance_score", "N/A")
-                    sentiment_score = ticker_info.get("ticker_sentiment_score", "N/A")
-                    sentiment_label_ticker = ticker_info.get("ticker_sentiment_label", "N/A")
-                    result += f"\n  - {ticker}: relevance={relevance}, sentiment={sentiment_score} ({sentiment_label_ticker})"
+                lines.append("\nTicker Sentiment:")
+                lines.extend(
+                    f"  - {ticker_info.get('ticker', 'N/A')}: "
+                    f"relevance={ticker_info.get('relevance_score', 'N/A')}, "
+                    f"sentiment={ticker_info.get('ticker_sentiment_score', 'N/A')} "
+                    f"({ticker_info.get('ticker_sentiment_label', 'N/A')})"
+                    for ticker_info in ticker_sentiment
+                )
             
             # Topics
             topics_list = article.get("topics", [])
             if topics_list:
                 topics_str = ", ".join([topic.get("topic", "") for topic in topics_list])
-                result += f"\n\nTopics: {topics_str}"
+                lines.append(f"\nTopics: {topics_str}")
         
-        return result
+        return lines
+    
+    def format_article(self, article: Dict[str, Any], include_details: bool = True) -> str:
+        """
+        Format a single article for display
+        
+        Args:
+            article: Article dictionary
+            include_details: Whether to include detailed sentiment info
+            
+        Returns:
+            Formatted string
+        """
+        return "\n".join(self._article_lines(article, include_details))
     
     def format_articles(
         self,
@@ -485,13 +877,37 @@ Summary: {summary[:500]}...
         if not articles:
             return "No articles found."
         
+        # One flat list of lines joined once, rather than joining per-article strings
         formatted = [f"Found {len(articles)} articles:\n"]
         for i, article in enumerate(articles, 1):
             formatted.append(f"\n--- Article {i} ---")
-            formatted.append(self.format_article(article, include_details))
+            formatted.extend(self._article_lines(article, include_details))
         
         return "\n".join(formatted)
     
+    def write_articles(
+        self,
+        stream: TextIO,
+        articles: List[Dict[str, Any]],
+        include_details: bool = True
+    ) -> None:
+        """
+        Write the format_articles() output to a stream one article at a time
+        
+        Args:
+            stream: Text stream to write to (e.g. an open file or sys.stdout)
+            articles: List of article dictionaries
+            include_details: Whether to include detailed sentiment info
+        """
+        if not articles:
+            stream.write("No articles found.")
+            return
+        
+        stream.write(f"Found {len(articles)} articles:\n")
+        for i, article in enumerate(articles, 1):
+            stream.write(f"\n\n--- Article {i} ---\n")
+            stream.write("\n".join(self._article_lines(article, include_details)))
+    
     def export_to_json(
         self,
         articles: List[Dict[str, Any]],
@@ -504,8 +920,13 @@ Summary: {summary[:500]}...
             articles: List of article dictionaries
             filename: Output filename
         """
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(articles, f, ensure_ascii=False, indent=2)
+        if orjson is not None:
+            # Same layout as json.dump(indent=2, ensure_ascii=False), encoded in C
+            with open(filename, "wb") as f:
+                f.write(orjson.dumps(articles, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(filename, "w", encoding="utf-8") as f:
+                json.dump(articles, f, ensure_ascii=False, indent=2)
         logger.info(f"Exported {len(articles)} articles to {filename}")
     
     def export_to_text(
@@ -522,8 +943,9 @@ Summary: {summary[:500]}...
             filename: Output filename
             include_details: Whether to include detailed sentiment info
         """
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write(self.format_articles(articles, include_details))
+        # Stream article by article (1 MiB buffer) instead of building the whole text first
+        with open(filename, "w", encoding="utf-8", buffering=1 << 20) as f:
+            self.write_articles(f, articles, include_details)
         logger.info(f"Exported {len(articles)} articles to {filename}")
 
 
@@ -618,12 +1040,23 @@ Examples:
         type=str,
         help="Alpha Vantage API key (overrides environment variable)"
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=(
+            "Always query the API instead of reusing responses cached in the last "
+            f"{DEFAULT_CACHE_TTL.total_seconds() / 60:g} minutes"
+        )
+    )
     
     args = parser.parse_args()
     
     # Initialize analyzer
     try:
-        analyzer = MarketNewsAnalyzer(api_key=args.api_key)
+        analyzer = MarketNewsAnalyzer(
+            api_key=args.api_key,
+            cache_ttl=None if args.no_cache else DEFAULT_CACHE_TTL
+        )
     except ValueError as e:
         print(f"Error: {e}")
         return 1
@@ -664,7 +1097,8 @@ Examples:
         
         # Display results
         print(f"\nFound {len(articles)} articles\n")
-        print(analyzer.format_articles(articles, include_details=not args.no_details))
+        analyzer.write_articles(sys.stdout, articles, include_details=not args.no_details)
+        sys.stdout.write("\n")
         
         # Analyze sentiment if requested
         if args.analyze_sentiment:
@@ -672,7 +1106,12 @@ Examples:
             print("SENTIMENT ANALYSIS")
             print("="*80)
             sentiment_stats = analyzer.analyze_sentiment(articles)
-            print(json.dumps(sentiment_stats, indent=2))
+            # Write straight to stdout rather than building the pretty-printed string first
+            if orjson is not None:
+                sys.stdout.write(orjson.dumps(sentiment_stats, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode("utf-8"))
+            else:
+                json.dump(sentiment_stats, sys.stdout, indent=2)
+            sys.stdout.write("\n")
         
         # Export if requested
         if args.export_json:
@@ -691,6 +1130,8 @@ Examples:
         print(f"Error: {e}")
         logger.exception("Error fetching news")
         return 1
+    finally:
+        analyzer.close()
 
 
 if __name__ == "__main__":
@@ -6,27 +6,122 @@ Handles MT5 connection and communicates with Electron via WebSocket
 import MetaTrader5 as mt5
 import json
 import asyncio
+import threading
+import queue
 import websockets
 import logging
-from datetime import datetime
+import atexit
+import functools
+from logging.handlers import QueueHandler, QueueListener
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from simulator import TradingSimulator
-import yfinance as yf
+from mt5_cache import cached_symbol_info, cached_terminal_info, clear_caches, load_rates_cached, load_deals_cached
 import requests
 
-logging.basicConfig(level=logging.INFO)
+# Log records are only enqueued on the calling thread; a listener thread does the
+# actual stream write so a slow stderr pipe never stalls a thread holding the MT5 lock
+log_queue = queue.Queue(-1)
+log_listener = QueueListener(log_queue, logging.StreamHandler())
+log_listener.start()
+atexit.register(log_listener.stop)
+logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(log_queue)])
 logger = logging.getLogger(__name__)
 
+# Position monitor polling tiers: (distance of the nearest SL/TP as a fraction of price, seconds between checks)
+POLL_TIERS = [(0.05, 60), (0.01, 10), (0.001, 2), (0.0, 1)]
+
+# Simulator get_positions re-persists positions and the settings file on every call,
+# so simulator mode keeps the original fixed interval instead of the adaptive tiers
+SIMULATOR_POLL_INTERVAL = 5
+
+# Deal history is requested from MT5 in windows of this size to keep each IPC payload small
+DEAL_HISTORY_WINDOW = timedelta(days=7)
+
+def poll_interval_for(distance_pct):
+    """Pick the position monitor sleep interval for the given SL/TP distance (None = nothing to watch)"""
+    if distance_pct is None:
+        return POLL_TIERS[0][1]
+    for threshold, interval in POLL_TIERS:
+        if distance_pct > threshold:
+            return interval
+    return POLL_TIERS[-1][1]
+
+# Below this many timestamps a plain fromtimestamp loop beats pandas' conversion overhead
+VECTORIZED_TIME_MIN_ROWS = 256
+
+@functools.lru_cache(maxsize=1)
+def local_zone_name():
+    """The system's local time zone as an IANA name via tzlocal, resolved once (None if unavailable)"""
+    from zoneinfo import ZoneInfo
+    
+    try:
+        import tzlocal
+        name = tzlocal.get_localzone_name()
+        zone = ZoneInfo(name)
+    except Exception:
+        return None
+    
+    # Only trust the name if it reproduces the local wall clock (now and half a year out, for DST)
+    now = datetime.now().timestamp()
+    for ts in (now, now + 183 * 86400):
+        if datetime.fromtimestamp(ts, zone).replace(tzinfo=None) != datetime.fromtimestamp(ts):
+            return None
+    return name
+
+def format_local_times(timestamps):
+    """datetime.fromtimestamp(ts).isoformat() for an array of Unix timestamps, vectorized for large arrays"""
+    import numpy as np
+    
+    timestamps = np.asarray(timestamps)
+    zone = local_zone_name() if len(timestamps) >= VECTORIZED_TIME_MIN_ROWS else None
+    if zone is None:
+        return [datetime.fromtimestamp(ts).isoformat() for ts in timestamps.tolist()]
+    
+    import pandas as pd
+    
+    # A named IANA zone lets pandas convert in C; a dateutil tzlocal() would fall back to a per-element path
+    local_times = pd.to_datetime(timestamps, unit='s', utc=True).tz_convert(zone).tz_localize(None)
+    return np.datetime_as_string(local_times.values.astype('datetime64[s]')).tolist()
+
+# Magic number tagging orders placed by the bridge
+MAGIC_NUMBER = 234000
+
+# Request fields that are the same for every market (deal) order
+MARKET_ORDER_DEFAULTS = {
+    "action": mt5.TRADE_ACTION_DEAL,
+    "deviation": 20,
+    "magic": MAGIC_NUMBER,
+    "type_time": mt5.ORDER_TIME_GTC,
+    "type_filling": mt5.ORDER_FILLING_IOC,
+}
+
+# Dark chart theme shared by the generated graphs
+CHART_COLORS = {'figure': '#1e1e1e', 'axes': '#2a2a2a', 'grid': '#444', 'text': 'white'}
+
+def style_chart_axis(ax):
+    """Apply the dark chart theme to a matplotlib axis (call before plotting)"""
+    ax.set_facecolor(CHART_COLORS['axes'])
+    ax.tick_params(colors=CHART_COLORS['text'])
+    ax.xaxis.label.set_color(CHART_COLORS['text'])
+    ax.yaxis.label.set_color(CHART_COLORS['text'])
+    ax.title.set_color(CHART_COLORS['text'])
+    for spine in ax.spines.values():
+        spine.set_color(CHART_COLORS['grid'])
+
 class MT5Bridge:
     def __init__(self, host='localhost', port=8765):
         self.host = host
         self.port = port
         self.connected_to_mt5 = False
+        self.mt5_credentials = (None, None, None)  # (login, password, server) of the last successful connect
         self.websocket = None
         self.twilio_config = {}
         self.alert_config = {}
         self.monitored_positions = {}  # Track positions for TP/SL alerts (alerts handled by Node.js)
         self.simulator_mode = False  # Simulator mode flag
         self.simulator = TradingSimulator()  # Simulator instance
+        self.mt5_lock = threading.Lock()  # Serializes MT5 API access across worker threads
         self.load_twilio_config()
         self.load_simulator_mode()
     
@@ -47,24 +142,46 @@ class MT5Bridge:
             self.twilio_config = {}
     
     def update_position_monitoring(self):
-        """Update monitored positions (TP/SL alerts handled by Node.js bridge)"""
+        """Update monitored positions (TP/SL alerts handled by Node.js bridge)
+        
+        Returns the distance from the closest SL/TP level as a fraction of price,
+        or None when no position has SL/TP set.
+        """
         # Position monitoring kept for potential future use
         # Twilio alerts are now handled by the Node.js bridge
         try:
             current_positions = self.get_positions()
             if isinstance(current_positions, dict) and 'error' in current_positions:
-                return
+                return None
             
             current_tickets = {pos['ticket'] for pos in current_positions}
             previous_tickets = set(self.monitored_positions.keys())
             
             # Update monitored positions (alerts handled by Node.js)
+            nearest = None
             for position in current_positions:
                 ticket = position['ticket']
                 self.monitored_positions[ticket] = position
                 
+                current_price = position['current_price']
+                if not current_price:
+                    continue
+                for level in (position['stop_loss'], position['take_profit']):
+                    if level:
+                        distance = abs(current_price - level) / current_price
+                        if nearest is None or distance < nearest:
+                            nearest = distance
+            
+            return nearest
+                
         except Exception as e:
             logger.error(f"Error updating position monitoring: {e}")
+            return None
+        
+    def locked_position_monitoring(self):
+        """Run update_position_monitoring while holding the MT5 lock (used from worker threads)"""
+        with self.mt5_lock:
+            return self.update_position_monitoring()
         
     def connect_mt5(self, login=None, password=None, server=None):
         """Connect to MetaTrader 5"""
@@ -80,9 +197,39 @@ class MT5Bridge:
                 return False
         
         self.connected_to_mt5 = True
+        self.mt5_credentials = (login, password, server)
+        clear_caches()  # Symbol specs may differ on a different account/server
         logger.info("Connected to MT5 successfully")
         return True
     
+    def ensure_terminal_connected(self):
+        """Check the terminal can reach the trade server before sending an order
+        
+        A silently dropped terminal makes order_send block until its timeout, so this
+        fails fast instead of letting an order hang at the moment it needs to go out.
+        """
+        terminal_info = cached_terminal_info()
+        if terminal_info is None:
+            # The IPC link to the terminal itself is gone - reconnect once with the stored
+            # credentials so the terminal comes back on the same account, not its default one
+            logger.warning("Lost the link to the MT5 terminal, reinitializing before sending order")
+            mt5.shutdown()
+            if not self.connect_mt5(*self.mt5_credentials):
+                logger.error("MT5 reinitialization failed, marking the bridge as disconnected")
+                self.connected_to_mt5 = False
+                return False
+            terminal_info = cached_terminal_info()
+            if terminal_info is None:
+                return False
+        
+        if not terminal_info.connected:
+            # Terminal is up but has lost its broker connection - it reconnects by itself,
+            # so keep the session and just refuse this order
+            logger.warning("MT5 terminal is not connected to the trade server")
+            return False
+        
+        return True
+    
     def get_account_info(self):
         """Get MT5 account information (real or simulated)"""
         if not self.connected_to_mt5:
@@ -107,6 +254,28 @@ class MT5Bridge:
             "currency": account_info.currency
         }
     
+    def lookup_symbol_info(self, symbol):
+        """Get live MT5 symbol info, falling back to alternative names for .cash symbols (None if not found)
+        
+        Not cached: trade_tick_value follows the account currency conversion rate, so P&L needs it fresh.
+        """
+        # Try multiple approaches to get symbol info for .cash symbols
+        symbol_info = mt5.symbol_info(symbol)
+        
+        # If symbol_info is None, try with uppercase or alternative formats
+        if symbol_info is None:
+            # Try uppercase version (e.g., "US30.CASH")
+            symbol_upper = symbol.upper()
+            symbol_info = mt5.symbol_info(symbol_upper)
+        
+        if symbol_info is None:
+            # Try without .cash suffix (e.g., "US30")
+            if '.cash' in symbol.lower():
+                base_symbol = symbol.split('.')[0]
+                symbol_info = mt5.symbol_info(base_symbol)
+        
+        return symbol_info
+    
     def get_positions(self):
         """Get open positions (real or simulated)"""
         # SIMULATOR MODE: Return simulated positions (works without MT5 connection)
@@ -114,25 +283,19 @@ class MT5Bridge:
             # Update prices for all simulated positions if MT5 is connected
             sim_positions = self.simulator.get_positions()
             if self.connected_to_mt5:
+                # Fetch each symbol's tick and info once, even with several positions on it
+                ticks = {}
+                symbol_infos = {}
                 for pos in sim_positions:
                     symbol = pos['symbol']
-                    tick = mt5.symbol_info_tick(symbol)
+                    if symbol not in ticks:
+                        ticks[symbol] = mt5.symbol_info_tick(symbol)
+                    tick = ticks[symbol]
                     if tick:
                         current_price = tick.bid if pos['type'] == 'BUY' else tick.ask
-                        # Try multiple approaches to get symbol info for .cash symbols
-                        symbol_info = mt5.symbol_info(symbol)
-                        
-                        # If symbol_info is None, try with uppercase or alternative formats
-                        if symbol_info is None:
-                            # Try uppercase version (e.g., "US30.CASH")
-                            symbol_upper = symbol.upper()
-                            symbol_info = mt5.symbol_info(symbol_upper)
-                        
-                        if symbol_info is None:
-                            # Try without .cash suffix (e.g., "US30")
-                            if '.cash' in symbol.lower():
-                                base_symbol = symbol.split('.')[0]
-                                symbol_info = mt5.symbol_info(base_symbol)
+                        if symbol not in symbol_infos:
+                            symbol_infos[symbol] = self.lookup_symbol_info(symbol)
+                        symbol_info = symbol_infos[symbol]
                         
                         if symbol_info:
                             contract_size = symbol_info.trade_contract_size or 100000
@@ -158,20 +321,9 @@ class MT5Bridge:
                 symbol_info_map = {}
                 for pos in sim_positions:
                     symbol = pos['symbol']
-                    # Try multiple approaches to get symbol info for .cash symbols
-                    symbol_info = mt5.symbol_info(symbol)
-                    
-                    # If symbol_info is None, try with uppercase or alternative formats
-                    if symbol_info is None:
-                        # Try uppercase version (e.g., "US30.CASH")
-                        symbol_upper = symbol.upper()
-                        symbol_info = mt5.symbol_info(symbol_upper)
-                    
-                    if symbol_info is None:
-                        # Try without .cash suffix (e.g., "US30")
-                        if '.cash' in symbol.lower():
-                            base_symbol = symbol.split('.')[0]
-                            symbol_info = mt5.symbol_info(base_symbol)
+                    if symbol not in symbol_infos:
+                        symbol_infos[symbol] = self.lookup_symbol_info(symbol)
+                    symbol_info = symbol_infos[symbol]
                     
                     if symbol_info:
                         symbol_info_map[symbol] = {
@@ -271,7 +423,7 @@ class MT5Bridge:
         request = {
             "action": mt5.TRADE_ACTION_REMOVE,
             "order": ticket,
-            "magic": 234000,
+            "magic": MAGIC_NUMBER,
         }
         
         logger.info(f"Cancelling pending order: ticket={ticket}")
@@ -313,7 +465,7 @@ class MT5Bridge:
         new_price = order.price_open if price is None else float(price)
         
         # Get symbol info for validation
-        symbol_info = mt5.symbol_info(order.symbol)
+        symbol_info = cached_symbol_info(order.symbol)
         if symbol_info is None:
             return {"success": False, "error": f"Symbol {order.symbol} not found"}
         
@@ -333,7 +485,7 @@ class MT5Bridge:
             "price": new_price,
             "sl": new_sl,
             "tp": new_tp,
-            "magic": 234000,
+            "magic": MAGIC_NUMBER,
         }
         
         logger.info(f"Modifying pending order: ticket={ticket}, price={new_price}, sl={new_sl}, tp={new_tp}")
@@ -386,7 +538,10 @@ class MT5Bridge:
         # REAL MODE: Execute actual trade
         logger.info(f"Executing order: {symbol} {order_type} {volume} SL:{sl} TP:{tp} ExecutionType:{execution_type}")
         
-        # Get symbol info - this validates the symbol exists
+        if not self.ensure_terminal_connected():
+            return {"success": False, "error": "MT5 terminal is not connected"}
+        
+        # Get symbol info - this validates the symbol exists (live, since visible changes on symbol_select)
         symbol_info = mt5.symbol_info(symbol)
         if symbol_info is None:
             logger.error(f"Symbol {symbol} not found")
@@ -430,7 +585,7 @@ class MT5Bridge:
                 "volume": volume,
                 "type": mt5.ORDER_TYPE_BUY_LIMIT if order_type == "BUY" else mt5.ORDER_TYPE_SELL_LIMIT,
                 "price": limit_price,
-                "magic": 234000,
+                "magic": MAGIC_NUMBER,
                 "type_time": mt5.ORDER_TIME_GTC,
             }
             
@@ -473,15 +628,11 @@ class MT5Bridge:
         
         # Prepare order request (matching price_UI.py structure)
         request = {
-            "action": mt5.TRADE_ACTION_DEAL,
+            **MARKET_ORDER_DEFAULTS,
             "symbol": symbol,
             "volume": volume,
             "type": mt5.ORDER_TYPE_BUY if order_type == "BUY" else mt5.ORDER_TYPE_SELL,
             "price": price,
-            "deviation": 20,
-            "magic": 234000,
-            "type_time": mt5.ORDER_TIME_GTC,
-            "type_filling": mt5.ORDER_FILLING_IOC,
         }
         
         # Add SL/TP only if specified (matching price_UI.py logic)
@@ -540,20 +691,7 @@ class MT5Bridge:
             close_price = tick.bid if position['type'] == 'BUY' else tick.ask
             
             # Get symbol info for accurate P&L calculation
-            # Try multiple approaches to get symbol info for .cash symbols
-            symbol_info = mt5.symbol_info(symbol)
-            
-            # If symbol_info is None, try with uppercase or alternative formats
-            if symbol_info is None:
-                # Try uppercase version (e.g., "US30.CASH")
-                symbol_upper = symbol.upper()
-                symbol_info = mt5.symbol_info(symbol_upper)
-            
-            if symbol_info is None:
-                # Try without .cash suffix (e.g., "US30")
-                if '.cash' in symbol.lower():
-                    base_symbol = symbol.split('.')[0]
-                    symbol_info = mt5.symbol_info(base_symbol)
+            symbol_info = self.lookup_symbol_info(symbol)
             
             if symbol_info:
                 tick_size = symbol_info.trade_tick_size or symbol_info.point or None
@@ -576,6 +714,9 @@ class MT5Bridge:
             return self.simulator.close_position(ticket, close_price, tick_size, tick_value, contract_size)
         
         # REAL MODE: Close actual position
+        if not self.ensure_terminal_connected():
+            return {"success": False, "error": "MT5 terminal is not connected"}
+        
         positions = mt5.positions_get(ticket=ticket)
         if positions is None or len(positions) == 0:
             return {"success": False, "error": "Position not found"}
@@ -583,19 +724,16 @@ class MT5Bridge:
         position = positions[0]
         
         close_type = mt5.ORDER_TYPE_SELL if position.type == mt5.ORDER_TYPE_BUY else mt5.ORDER_TYPE_BUY
-        price = mt5.symbol_info_tick(position.symbol).bid if position.type == mt5.ORDER_TYPE_BUY else mt5.symbol_info_tick(position.symbol).ask
+        tick = mt5.symbol_info_tick(position.symbol)
+        price = tick.bid if position.type == mt5.ORDER_TYPE_BUY else tick.ask
         
         request = {
-            "action": mt5.TRADE_ACTION_DEAL,
+            **MARKET_ORDER_DEFAULTS,
             "symbol": position.symbol,
             "volume": position.volume,
             "type": close_type,
             "position": ticket,
             "price": price,
-            "deviation": 20,
-            "magic": 234000,
-            "type_time": mt5.ORDER_TIME_GTC,
-            "type_filling": mt5.ORDER_FILLING_IOC,
         }
         
         result = mt5.order_send(request)
@@ -630,7 +768,7 @@ class MT5Bridge:
         new_tp = position.tp if tp is None else float(tp)
         
         # Get symbol info for validation
-        symbol_info = mt5.symbol_info(position.symbol)
+        symbol_info = cached_symbol_info(position.symbol)
         if symbol_info is None:
             return {"success": False, "error": f"Symbol {position.symbol} not found"}
         
@@ -916,8 +1054,8 @@ class MT5Bridge:
                 # Get last N bars
                 rates = mt5.copy_rates_from_pos(symbol, tf, 0, bars)
             elif start_date and end_date:
-                # Get rates between dates
-                rates = mt5.copy_rates_range(symbol, tf, start_date, end_date)
+                # Get rates between dates (only bars newer than the on-disk cache are fetched)
+                rates = load_rates_cached(symbol, tf, start_date, end_date)
             else:
                 # Default: get last 1000 bars
                 rates = mt5.copy_rates_from_pos(symbol, tf, 0, 1000)
@@ -925,17 +1063,20 @@ class MT5Bridge:
             if rates is None or len(rates) == 0:
                 return {"error": f"No data available for {symbol}"}
             
-            # Convert to list of dictionaries
-            result = []
-            for rate in rates:
-                result.append({
-                    "time": datetime.fromtimestamp(rate['time']).isoformat(),
-                    "open": float(rate['open']),
-                    "high": float(rate['high']),
-                    "low": float(rate['low']),
-                    "close": float(rate['close']),
-                    "volume": int(rate['tick_volume'])
-                })
+            # Convert to list of dictionaries - read each field as a whole column
+            # (tolist() yields Python floats/ints) instead of indexing every structured row
+            columns = zip(
+                format_local_times(rates['time']),
+                rates['open'].tolist(),
+                rates['high'].tolist(),
+                rates['low'].tolist(),
+                rates['close'].tolist(),
+                rates['tick_volume'].tolist(),
+            )
+            result = [
+                {"time": time_str, "open": o, "high": h, "low": l, "close": c, "volume": v}
+                for time_str, o, h, l, c, v in columns
+            ]
             
             return {
                 "symbol": symbol,
@@ -997,6 +1138,64 @@ class MT5Bridge:
             logger.error(f"Error calculating percentage change: {e}")
             return {"error": str(e)}
     
+    def get_deal_history_frame(self, start_date, end_date):
+        """Get deal history between two dates as a DataFrame (None if MT5 fails)
+        
+        The range is fetched in DEAL_HISTORY_WINDOW chunks on a single producer thread,
+        so the next window's MT5 call overlaps with converting the previous one.
+        """
+        import pandas as pd
+        
+        windows = []
+        window_start = start_date
+        while window_start < end_date:
+            window_end = min(window_start + DEAL_HISTORY_WINDOW, end_date)
+            windows.append((window_start, window_end))
+            window_start = window_end
+        
+        window_queue = queue.Queue(maxsize=2)
+        stop = threading.Event()
+        
+        def produce():
+            # Only this thread talks to MT5 while the windows are being fetched
+            try:
+                for window_start, window_end in windows:
+                    if stop.is_set():
+                        return
+                    deals = mt5.history_deals_get(window_start, window_end)
+                    window_queue.put(deals)
+                    if deals is None:
+                        return
+            except Exception as e:
+                window_queue.put(e)
+        
+        frames = []
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(produce)
+            try:
+                for _ in windows:
+                    deals = window_queue.get()
+                    if isinstance(deals, Exception):
+                        raise deals
+                    if deals is None:
+                        return None
+                    if len(deals) > 0:
+                        frames.append(pd.DataFrame(list(deals), columns=deals[0]._fields))
+            finally:
+                stop.set()
+                # Unblock the producer if it is still waiting on a full queue
+                while not future.done():
+                    try:
+                        window_queue.get(timeout=0.1)
+                    except queue.Empty:
+                        pass
+        
+        if not frames:
+            return pd.DataFrame()
+        
+        # Deals on a window boundary can be returned twice
+        return pd.concat(frames, ignore_index=True).drop_duplicates('ticket')
+    
     def get_closed_positions(self, days_back=7):
         """Get closed positions (deal history) for the specified number of days"""
         if not self.connected_to_mt5:
@@ -1008,76 +1207,77 @@ class MT5Bridge:
         
         # REAL MODE: Return actual closed positions
         try:
-            from datetime import datetime, timedelta
-            
             # Calculate date range (supports fractional days for hours)
             end_date = datetime.now()
             start_date = end_date - timedelta(days=days_back)
             
-            # Get deal history
-            deals = mt5.history_deals_get(start_date, end_date)
+            # Get deal history (incrementally cached per login and server when the account is known)
+            account_info = mt5.account_info()
+            if account_info is not None:
+                df = load_deals_cached(account_info.login, account_info.server, start_date, end_date, self.get_deal_history_frame)
+            else:
+                df = self.get_deal_history_frame(start_date, end_date)
             
-            if deals is None:
+            if df is None:
                 return {"error": "Failed to get deal history"}
             
-            if len(deals) == 0:
+            if df.empty:
                 return []
             
-            # Group deals by position ticket to calculate P&L
-            position_deals = {}
-            
-            for deal in deals:
-                # Only process position deals (not balance operations)
-                if deal.type in [mt5.DEAL_TYPE_BUY, mt5.DEAL_TYPE_SELL]:
-                    position_ticket = deal.position_id
-                    
-                    if position_ticket not in position_deals:
-                        position_deals[position_ticket] = []
-                    
-                    position_deals[position_ticket].append(deal)
-            
-            # Process closed positions
-            closed_positions = []
+            import numpy as np
+            import pandas as pd
             
-            for position_ticket, deals_list in position_deals.items():
-                if len(deals_list) < 2:  # Need at least open and close deals
-                    continue
-                
-                # Sort deals by time
-                deals_list.sort(key=lambda x: x.time)
-                
-                open_deal = deals_list[0]  # First deal (position open)
-                close_deal = deals_list[-1]  # Last deal (position close)
-                
-                # Calculate total profit/loss for this position
-                total_profit = sum(deal.profit for deal in deals_list)
-                total_volume = sum(deal.volume for deal in deals_list if deal.entry == mt5.DEAL_ENTRY_IN)
-                
-                # Determine position type
-                position_type = "BUY" if open_deal.type == mt5.DEAL_TYPE_BUY else "SELL"
-                
-                closed_position = {
-                    "ticket": position_ticket,
-                    "symbol": open_deal.symbol,
-                    "type": position_type,
-                    "volume": total_volume,
-                    "open_price": open_deal.price,
-                    "close_price": close_deal.price,
-                    "open_time": datetime.fromtimestamp(open_deal.time).isoformat(),
-                    "close_time": datetime.fromtimestamp(close_deal.time).isoformat(),
-                    "profit": round(total_profit, 2),
-                    "swap": sum(deal.swap for deal in deals_list),
-                    "commission": sum(deal.commission for deal in deals_list),
-                    "comment": close_deal.comment or "",
-                    "duration_minutes": round((close_deal.time - open_deal.time) / 60, 1)
-                }
-                
-                closed_positions.append(closed_position)
+            # Group deals by position ticket to calculate P&L (vectorized over all deals)
+            # Only process position deals (not balance operations)
+            df = df[df['type'].isin([mt5.DEAL_TYPE_BUY, mt5.DEAL_TYPE_SELL])]
+            
+            # Positions in the order MT5 first reported them (keeps ties in close time stable)
+            position_order = df['position_id'].unique()
+            
+            # Sort deals by time so the first/last deal of each position is its open/close
+            df = df.sort_values('time', kind='stable')
+            grouped = df.groupby('position_id', sort=False)
+            
+            totals = grouped.agg(
+                deal_count=('ticket', 'size'),
+                profit=('profit', 'sum'),
+                swap=('swap', 'sum'),
+                commission=('commission', 'sum')
+            ).reindex(position_order)
+            totals['volume'] = df[df['entry'] == mt5.DEAL_ENTRY_IN].groupby('position_id')['volume'].sum()
+            totals['volume'] = totals['volume'].fillna(0.0)
+            
+            open_deals = df.drop_duplicates('position_id', keep='first').set_index('position_id')
+            close_deals = df.drop_duplicates('position_id', keep='last').set_index('position_id')
+            
+            positions = totals.join(open_deals[['symbol', 'type', 'price', 'time']]) \
+                              .join(close_deals[['price', 'time', 'comment']], rsuffix='_close')
+            
+            # Need at least open and close deals
+            positions = positions[positions['deal_count'] >= 2].fillna({'comment': ''})
+            
+            # Build the closed positions column-wise and convert to records once
+            closed_positions = pd.DataFrame({
+                "ticket": positions.index,
+                "symbol": positions['symbol'],
+                "type": np.where(positions['type'] == mt5.DEAL_TYPE_BUY, "BUY", "SELL"),
+                "volume": positions['volume'],
+                "open_price": positions['price'],
+                "close_price": positions['price_close'],
+                "open_time": format_local_times(positions['time']),
+                "close_time": format_local_times(positions['time_close']),
+                # Python round() keeps the displayed values identical to the per-deal version
+                "profit": [round(profit, 2) for profit in positions['profit'].tolist()],
+                "swap": positions['swap'],
+                "commission": positions['commission'],
+                "comment": positions['comment'],
+                "duration_minutes": [round(seconds / 60, 1) for seconds in (positions['time_close'] - positions['time']).tolist()]
+            }, index=positions.index)
             
             # Sort by close time (most recent first)
-            closed_positions.sort(key=lambda x: x['close_time'], reverse=True)
+            closed_positions = closed_positions.sort_values('close_time', ascending=False, kind='stable')
             
-            return closed_positions
+            return closed_positions.to_dict(orient='records')
             
         except Exception as e:
             logger.error(f"Error getting closed positions: {e}")
@@ -1086,6 +1286,9 @@ class MT5Bridge:
     def get_yfinance_data(self, symbol, data_type='price', period='1d', interval='1m'):
         """Get data from yFinance for the specified symbol"""
         try:
+            # Imported lazily: yfinance pulls in pandas and adds noticeably to bridge startup
+            import yfinance as yf
+            
             logger.info(f"Fetching yFinance data for {symbol}: {data_type}, period={period}, interval={interval}")
             
             # Create ticker object
@@ -1812,55 +2015,52 @@ class MT5Bridge:
             
             # Generate graph if requested
             if show_graph:
-                # Create figure with subplots
-                fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 10), 
-                                                gridspec_kw={'height_ratios': [2, 1]})
-                fig.suptitle(f'{symbol} - Price and RSI({period})', fontsize=16, fontweight='bold')
-                
-                # Set dark theme
-                fig.patch.set_facecolor('#1e1e1e')
-                for ax in [ax1, ax2]:
-                    ax.set_facecolor('#2a2a2a')
-                    ax.tick_params(colors='white')
-                    ax.xaxis.label.set_color('white')
-                    ax.yaxis.label.set_color('white')
-                    ax.title.set_color('white')
-                    for spine in ax.spines.values():
-                        spine.set_color('#444')
-                
-                # Plot price
-                ax1.plot(df['time'], df['close'], label='Close Price', color='#2962FF', linewidth=1.5)
-                ax1.set_ylabel('Price', fontsize=12, color='white')
-                ax1.grid(True, alpha=0.3, color='#444')
-                ax1.legend(loc='upper left', facecolor='#2a2a2a', labelcolor='white')
-                ax1.set_title('Price Chart', fontsize=12, color='white')
-                
-                # Plot RSI
-                ax2.plot(df['time'], df['rsi'], label=f'RSI({period})', color='#FF6D00', linewidth=1.5)
-                ax2.axhline(y=70, color='#ff5722', linestyle='--', alpha=0.7, label='Overbought (70)')
-                ax2.axhline(y=30, color='#4CAF50', linestyle='--', alpha=0.7, label='Oversold (30)')
-                ax2.axhline(y=50, color='gray', linestyle='-', alpha=0.3)
-                ax2.fill_between(df['time'], 30, 70, alpha=0.1, color='gray')
-                ax2.set_ylabel('RSI', fontsize=12, color='white')
-                ax2.set_xlabel('Time', fontsize=12, color='white')
-                ax2.set_ylim(0, 100)
-                ax2.grid(True, alpha=0.3, color='#444')
-                ax2.legend(loc='upper left', facecolor='#2a2a2a', labelcolor='white')
-                ax2.set_title(f'RSI Indicator (Period: {period})', fontsize=12, color='white')
-                
-                # Format x-axis
-                plt.setp(ax1.xaxis.get_majorticklabels(), rotation=45, ha='right', color='white')
-                plt.setp(ax2.xaxis.get_majorticklabels(), rotation=45, ha='right', color='white')
-                
-                plt.tight_layout()
-                
-                # Save to buffer and convert to base64
-                buffer = BytesIO()
-                plt.savefig(buffer, format='png', dpi=150, bbox_inches='tight', 
-                           facecolor='#1e1e1e', edgecolor='none')
-                buffer.seek(0)
-                image_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
-                plt.close(fig)
+                # Drop sub-pixel path segments - makes savefig much cheaper on dense (e.g. M1) series.
+                # Scoped with rc_context so other charts rendered in this process keep the defaults
+                with plt.rc_context({'path.simplify': True, 'path.simplify_threshold': 1.0}):
+                    # Create figure with subplots
+                    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 10), 
+                                                    gridspec_kw={'height_ratios': [2, 1]})
+                    fig.suptitle(f'{symbol} - Price and RSI({period})', fontsize=16, fontweight='bold')
+                    
+                    # Set dark theme
+                    fig.patch.set_facecolor(CHART_COLORS['figure'])
+                    for ax in (ax1, ax2):
+                        style_chart_axis(ax)
+                    
+                    # Plot price
+                    ax1.plot(df['time'], df['close'], label='Close Price', color='#2962FF', linewidth=1.5)
+                    ax1.set_ylabel('Price', fontsize=12, color=CHART_COLORS['text'])
+                    ax1.grid(True, alpha=0.3, color=CHART_COLORS['grid'])
+                    ax1.legend(loc='upper left', facecolor=CHART_COLORS['axes'], labelcolor=CHART_COLORS['text'])
+                    ax1.set_title('Price Chart', fontsize=12, color=CHART_COLORS['text'])
+                    
+                    # Plot RSI
+                    ax2.plot(df['time'], df['rsi'], label=f'RSI({period})', color='#FF6D00', linewidth=1.5)
+                    ax2.axhline(y=70, color='#ff5722', linestyle='--', alpha=0.7, label='Overbought (70)')
+                    ax2.axhline(y=30, color='#4CAF50', linestyle='--', alpha=0.7, label='Oversold (30)')
+                    ax2.axhline(y=50, color='gray', linestyle='-', alpha=0.3)
+                    ax2.fill_between(df['time'], 30, 70, alpha=0.1, color='gray')
+                    ax2.set_ylabel('RSI', fontsize=12, color=CHART_COLORS['text'])
+                    ax2.set_xlabel('Time', fontsize=12, color=CHART_COLORS['text'])
+                    ax2.set_ylim(0, 100)
+                    ax2.grid(True, alpha=0.3, color=CHART_COLORS['grid'])
+                    ax2.legend(loc='upper left', facecolor=CHART_COLORS['axes'], labelcolor=CHART_COLORS['text'])
+                    ax2.set_title(f'RSI Indicator (Period: {period})', fontsize=12, color=CHART_COLORS['text'])
+                    
+                    # Format x-axis
+                    for ax in (ax1, ax2):
+                        plt.setp(ax.xaxis.get_majorticklabels(), rotation=45, ha='right', color=CHART_COLORS['text'])
+                    
+                    plt.tight_layout()
+                    
+                    # Save to buffer and convert to base64
+                    buffer = BytesIO()
+                    plt.savefig(buffer, format='png', dpi=150, bbox_inches='tight', 
+                               facecolor=CHART_COLORS['figure'], edgecolor='none')
+                    buffer.seek(0)
+                    image_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
+                    plt.close(fig)
                 
                 result['image_base64'] = image_base64
                 
@@ -1877,6 +2077,20 @@ class MT5Bridge:
         """Handle incoming WebSocket messages from Electron"""
         try:
             data = json.loads(message)
+            
+            # MT5's C API is synchronous - run the action on a worker thread so
+            # the event loop keeps serving the socket and the position monitor
+            response = await asyncio.to_thread(self.dispatch_action, data)
+            
+            await websocket.send(json.dumps(response))
+            
+        except Exception as e:
+            logger.error(f"Error handling message: {e}")
+            await websocket.send(json.dumps({"error": str(e), "messageId": data.get('messageId') if 'data' in locals() else None}))
+    
+    def dispatch_action(self, data):
+        """Run a single WebSocket action and build its response (blocking, call off the event loop)"""
+        with self.mt5_lock:
             action = data.get('action')
             message_id = data.get('messageId')
             
@@ -2092,11 +2306,7 @@ class MT5Bridge:
             else:
                 response['error'] = f"Unknown action: {action}"
             
-            await websocket.send(json.dumps(response))
-            
-        except Exception as e:
-            logger.error(f"Error handling message: {e}")
-            await websocket.send(json.dumps({"error": str(e), "messageId": data.get('messageId') if 'data' in locals() else None}))
+        return response
     
     async def start_server(self):
         """Start WebSocket server with position monitoring"""
@@ -2116,9 +2326,11 @@ class MT5Bridge:
             """Monitor positions for TP/SL alerts"""
             while True:
                 try:
+                    distance = None
                     if self.connected_to_mt5:
-                        self.update_position_monitoring()
-                    await asyncio.sleep(5)  # Check every 5 seconds
+                        distance = await asyncio.to_thread(self.locked_position_monitoring)
+                    # Poll faster as price approaches a SL/TP level, back off when nothing is close
+                    await asyncio.sleep(SIMULATOR_POLL_INTERVAL if self.simulator_mode else poll_interval_for(distance))
                 except Exception as e:
                     logger.error(f"Error in position monitoring: {e}")
                     await asyncio.sleep(10)  # Wait longer on error
@@ -2140,6 +2352,7 @@ class MT5Bridge:
         """Shutdown MT5 connection"""
         if self.connected_to_mt5:
             mt5.shutdown()
+            clear_caches()
             logger.info("MT5 connection closed")
 
 if __name__ == "__main__":
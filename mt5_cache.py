@@ -0,0 +1,226 @@
+"""
+MT5 Cache Module - Caches for MT5 terminal lookups
+Short-lived in-memory caches for data that rarely changes, plus incremental on-disk
+caches for bar and deal history so repeat queries only fetch the newest data
+"""
+
+import os
+import re
+import time
+import json
+import logging
+import calendar
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import wraps
+
+import numpy as np
+import MetaTrader5 as mt5
+
+from cache_utils import CACHE_ROOT, atomic_write
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = CACHE_ROOT
+MAX_CACHED_BARS = 100_000
+DEAL_CACHE_RETENTION_SECONDS = 365 * 86400
+
+# path -> (mtime_ns, parsed contents) for the most recently read files, so repeat polls
+# skip re-reading an unchanged file without keeping every symbol's history in memory
+MAX_LOADED_FILES = 4
+_loaded_files = OrderedDict()
+_loaded_files_lock = threading.Lock()
+
+
+def ttl_cache(seconds):
+    """Cache a function's results per argument tuple for the given number of seconds.
+
+    None results (lookup failures) are not cached so a missing symbol is retried next call.
+    """
+    def decorator(func):
+        entries = {}
+
+        @wraps(func)
+        def wrapper(*args):
+            now = time.monotonic()
+            entry = entries.get(args)
+            if entry is not None and entry[1] > now:
+                return entry[0]
+
+            value = func(*args)
+            if value is not None:
+                entries[args] = (value, now + seconds)
+            return value
+
+        wrapper.cache_clear = entries.clear
+        return wrapper
+    return decorator
+
+
+@ttl_cache(seconds=60)
+def cached_symbol_info(symbol):
+    """mt5.symbol_info cached for 60s - use for static contract specs only (tick size, point, contract size)
+    
+    bid/ask, trade_tick_value and visible in the result go stale, read those from mt5.symbol_info directly.
+    """
+    return mt5.symbol_info(symbol)
+
+
+@ttl_cache(seconds=1)
+def cached_terminal_info():
+    """mt5.terminal_info cached for 1s - a cheap liveness check for the order paths"""
+    return mt5.terminal_info()
+
+
+def clear_caches():
+    """Drop all cached MT5 data (call when connecting or shutting down the terminal)"""
+    cached_symbol_info.cache_clear()
+    cached_terminal_info.cache_clear()
+
+
+def to_mt5_timestamp(value):
+    """Convert a datetime (naive = UTC, as MT5 treats it) or Unix timestamp to integer seconds"""
+    if isinstance(value, datetime):
+        return calendar.timegm(value.utctimetuple())
+    return int(value)
+
+
+def _cache_path(name):
+    # No makedirs here - atomic_write creates the directory, so an unwritable home only costs the cache
+    return os.path.join(CACHE_DIR, name)
+
+
+def _read_cached_file(path, load):
+    """Return load(path), reusing the previous result while the file's mtime is unchanged (None if unreadable)"""
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    with _loaded_files_lock:
+        entry = _loaded_files.get(path)
+        if entry is not None and entry[0] == mtime:
+            _loaded_files.move_to_end(path)
+            return entry[1]
+    try:
+        value = load(path)
+    except Exception:
+        return None
+    with _loaded_files_lock:
+        _loaded_files[path] = (mtime, value)
+        _loaded_files.move_to_end(path)
+        while len(_loaded_files) > MAX_LOADED_FILES:
+            _loaded_files.popitem(last=False)
+    return value
+
+
+def _load_rates_file(path):
+    with np.load(path) as data:
+        return data['rates'], int(data['covered_from'])
+
+
+def _load_deals_file(path):
+    import pandas as pd
+    
+    with open(path, 'r') as f:
+        data = json.load(f)
+    return pd.DataFrame(data['data'], columns=data['columns']), data['covered_from']
+
+
+def load_rates_cached(symbol, timeframe, start, end):
+    """mt5.copy_rates_range backed by ~/.comfytrade/cache/{symbol}_{timeframe}.npz
+
+    Only bars from the last cached bar onwards are requested from MT5 (the last bar is
+    refetched since it may still have been forming). The file is rewritten only when that
+    tail changes something and keeps at most MAX_CACHED_BARS bars. Returns None if MT5 fails.
+    """
+    start_ts = to_mt5_timestamp(start)
+    end_ts = to_mt5_timestamp(end)
+    path = _cache_path(f"{symbol}_{timeframe}.npz")
+    
+    cached, covered_from = _read_cached_file(path, _load_rates_file) or (None, None)
+    
+    changed = True
+    if cached is not None and len(cached) > 0 and covered_from <= start_ts:
+        last_bar = int(cached['time'][-1])
+        if end_ts < last_bar:
+            mask = (cached['time'] >= start_ts) & (cached['time'] <= end_ts)
+            return cached[mask]
+        
+        tail = mt5.copy_rates_range(symbol, timeframe, last_bar, end_ts)
+        if tail is None:
+            return None
+        if len(tail) > 0 and not np.array_equal(tail, cached[-1:]):
+            merged = np.concatenate([cached[cached['time'] < last_bar], tail])
+        else:
+            merged = cached
+            changed = False
+    else:
+        merged = mt5.copy_rates_range(symbol, timeframe, start_ts, end_ts)
+        if merged is None:
+            return None
+        covered_from = start_ts
+    
+    if changed and len(merged) > 0:
+        stored = merged
+        stored_from = covered_from
+        if len(stored) > MAX_CACHED_BARS:
+            stored = stored[-MAX_CACHED_BARS:]
+            stored_from = int(stored['time'][0])
+        atomic_write(path, lambda f: np.savez(f, rates=stored, covered_from=np.int64(stored_from)))
+    
+    mask = (merged['time'] >= start_ts) & (merged['time'] <= end_ts)
+    return merged[mask]
+
+
+def load_deals_cached(login, server, start, end, fetch_deals):
+    """Deal history DataFrame backed by ~/.comfytrade/cache/deals_{login}_{server}.json
+
+    fetch_deals(start, end) must return a DataFrame of deals (or None on failure); it is
+    only called for the range after the newest cached deal. The file is rewritten only when
+    new deals arrive and drops deals older than DEAL_CACHE_RETENTION_SECONDS. Returns None on failure.
+    """
+    import pandas as pd
+    
+    start_ts = to_mt5_timestamp(start)
+    end_ts = to_mt5_timestamp(end)
+    server_key = re.sub(r'[^A-Za-z0-9_.-]', '_', server or '')
+    path = _cache_path(f"deals_{login}_{server_key}.json")
+    
+    cached, covered_from = _read_cached_file(path, _load_deals_file) or (None, None)
+    
+    changed = True
+    if cached is not None and not cached.empty and covered_from <= start_ts:
+        last_deal = int(cached['time'].max())
+        # Naive UTC, matching how MT5 interprets naive datetimes
+        tail_start = datetime.fromtimestamp(last_deal, tz=timezone.utc).replace(tzinfo=None)
+        tail = fetch_deals(tail_start, end)
+        if tail is None:
+            return None
+        # An empty range comes back as a DataFrame without columns
+        new_deals = tail[~tail['ticket'].isin(cached['ticket'])] if not tail.empty else tail
+        if not new_deals.empty:
+            merged = pd.concat([cached, new_deals], ignore_index=True)
+        else:
+            merged = cached
+            changed = False
+    else:
+        merged = fetch_deals(start, end)
+        if merged is None:
+            return None
+        if merged.empty:
+            return merged
+        covered_from = start_ts
+    
+    if changed:
+        cutoff = int(time.time()) - DEAL_CACHE_RETENTION_SECONDS
+        stored = merged
+        stored_from = covered_from
+        if stored_from < cutoff:
+            stored = stored[stored['time'] >= cutoff]
+            stored_from = cutoff
+        payload = {"covered_from": stored_from, "columns": list(stored.columns),
+                   "data": stored.astype(object).values.tolist()}
+        atomic_write(path, lambda f: f.write(json.dumps(payload).encode('utf-8')))
+    
+    return merged[(merged['time'] >= start_ts) & (merged['time'] <= end_ts)]